@@ -1,6 +1,58 @@
+import functools
+import itertools
 import json
+import mmap
 import os
-from typing import Dict, List, Tuple, Set
+import pathlib
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple, Set
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Directory of this script; relative paths are resolved against it
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Output buffer size, so large pages are written with few write() syscalls
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Filter menu options: choice number -> (field, display name)
+_FILTER_FIELDS = {
+    1: ("skin_type", "Skin Type"),
+    2: ("diet", "Diet"),
+    3: ("type", "Type"),
+    4: ("location", "Location")
+}
+
+# Detail rows shown on each animal card, in display order
+_DETAIL_ROWS = (
+    ("diet", "Diet"),
+    ("location", "Location"),
+    ("type", "Type"),
+    ("skin_type", "Skin Type"),
+    ("lifespan", "Lifespan"),
+)
+# Marks a characteristics key as absent, so present falsy values still render
+_MISSING = object()
+_ROW = '            <li class="detail__item"><strong>{}:</strong> {}</li>\n'
+_TITLE = '    <div class="card__title">{}</div>\n'
+_LI_TEMPLATE = (
+    '<li class="cards__item">\n'
+    '{title}'
+    '    <div class="card__text">\n'
+    '        <ul class="animal__details">\n'
+    '{rows}'
+    '        </ul>\n'
+    '    </div>\n'
+    '</li>\n'
+)
 
 
 def load_data(file_path: str) -> List[Dict]:
@@ -13,11 +65,33 @@ def load_data(file_path: str) -> List[Dict]:
     Returns:
         List[Dict]: List of dictionaries containing animal data
     """
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    absolute_path = os.path.join(current_dir, file_path)
+    absolute_path = os.path.join(_BASE_DIR, file_path)
 
-    with open(absolute_path, "r", encoding='utf-8') as handle:
-        return json.load(handle)
+    if simdjson is None and orjson is None:
+        # The stdlib parser needs bytes anyway, so read the file in one call
+        return json.loads(pathlib.Path(absolute_path).read_bytes())
+
+    fd = os.open(absolute_path, os.O_RDONLY)
+    try:
+        # An empty file cannot be mapped; report it like any other invalid document
+        if os.fstat(fd).st_size == 0:
+            raise json.JSONDecodeError("Expecting value", "", 0)
+
+        # Map the file instead of reading it so the parser works on the page cache
+        mapping = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        try:
+            # Prefer the SIMD parser, falling back to orjson when it is missing
+            if simdjson is not None:
+                try:
+                    return simdjson.Parser().parse(mapping, recursive=True)
+                except ValueError as e:
+                    raise json.JSONDecodeError(str(e), "", 0) from e
+            with memoryview(mapping) as view:
+                return orjson.loads(view)
+        finally:
+            mapping.close()
+    finally:
+        os.close(fd)
 
 
 def serialize_animal(animal: Dict) -> str:
@@ -30,42 +104,41 @@ def serialize_animal(animal: Dict) -> str:
     Returns:
         str: HTML formatted string for a single animal
     """
-    output = '<li class="cards__item">\n'
-
-    if "name" in animal:
-        output += f'    <div class="card__title">{animal["name"]}</div>\n'
-
-    output += '    <div class="card__text">\n'
-    output += '        <ul class="animal__details">\n'
-
-    # Check if characteristics exists
-    if "characteristics" in animal:
-        chars = animal["characteristics"]
-
-        # Diet information
-        if "diet" in chars:
-            output += f'            <li class="detail__item"><strong>Diet:</strong> {chars["diet"]}</li>\n'
-
-        # Location information
-        if "locations" in animal and animal["locations"]:
-            output += f'            <li class="detail__item"><strong>Location:</strong> {animal["locations"][0]}</li>\n'
-
-        # Type information
-        if "type" in chars:
-            output += f'            <li class="detail__item"><strong>Type:</strong> {chars["type"]}</li>\n'
-
-        # Skin type information
-        if "skin_type" in chars:
-            output += f'            <li class="detail__item"><strong>Skin Type:</strong> {chars["skin_type"]}</li>\n'
+    name = animal.get("name")
+    chars = animal.get("characteristics")
+
+    rows = []
+    append = rows.append
+    # Details, including location, are only shown for animals with characteristics
+    if chars is not None:
+        locations = animal.get("locations")
+        for key, label in _DETAIL_ROWS:
+            if key == "location":
+                # Location comes from the first listed location, not characteristics
+                if locations:
+                    append(_ROW.format(label, locations[0]))
+            else:
+                value = chars.get(key, _MISSING)
+                if value is not _MISSING:
+                    append(_ROW.format(label, value))
+
+    return _LI_TEMPLATE.format_map({
+        "title": _TITLE.format(name) if name is not None else "",
+        "rows": "".join(rows),
+    })
+
+
+def iter_serialized_animals(animals: List[Dict]) -> Iterable[str]:
+    """
+    Lazily serializes each animal to its HTML card.
 
-        # Lifespan information
-        if "lifespan" in chars:
-            output += f'            <li class="detail__item"><strong>Lifespan:</strong> {chars["lifespan"]}</li>\n'
+    Args:
+        animals (List[Dict]): List of animal dictionaries
 
-    output += '        </ul>\n'
-    output += '    </div>\n'
-    output += '</li>\n'
-    return output
+    Returns:
+        Iterable[str]: HTML formatted string for each animal, in order
+    """
+    return map(serialize_animal, animals)
 
 
 def serialize_animals_list(animals: List[Dict]) -> str:
@@ -78,9 +151,10 @@ def serialize_animals_list(animals: List[Dict]) -> str:
     Returns:
         str: Complete HTML formatted string for all animals
     """
-    return "".join(serialize_animal(animal) for animal in animals)
+    return "".join(iter_serialized_animals(animals))
 
 
+@functools.lru_cache(maxsize=8)
 def read_template(template_path: str) -> str:
     """
     Reads HTML template file.
@@ -91,142 +165,189 @@ def read_template(template_path: str) -> str:
     Returns:
         str: Content of template file
     """
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    absolute_path = os.path.join(current_dir, template_path)
+    absolute_path = os.path.join(_BASE_DIR, template_path)
 
     with open(absolute_path, "r", encoding='utf-8') as file:
         return file.read()
 
 
-def write_html(html_content: str, output_path: str) -> None:
+def write_html_chunks(html_chunks: Iterable[str], output_path: str) -> None:
     """
-    Writes HTML content to file.
+    Streams HTML content pieces to a file, replacing it only once complete.
 
     Args:
-        html_content (str): HTML content to write
+        html_chunks (Iterable[str]): HTML content pieces to write in order
         output_path (str): Path to output file
     """
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    absolute_path = os.path.join(current_dir, output_path)
+    absolute_path = os.path.join(_BASE_DIR, output_path)
+    # Write next to the target so the final rename stays on one filesystem
+    temp_path = f"{absolute_path}.{os.getpid()}.tmp"
 
-    with open(absolute_path, "w", encoding='utf-8') as file:
-        file.write(html_content)
+    try:
+        with open(temp_path, "w", encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as file:
+            file.writelines(html_chunks)
+        os.replace(temp_path, absolute_path)
+    except BaseException:
+        # Leave any previous output untouched if generation fails midway
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
 
 
-def get_unique_values(animals: List[Dict], field: str) -> Set[str]:
+def _field_value(animal: Dict, field: str) -> Optional[str]:
     """
-    Gets all unique values for a given field from the animals data.
+    Looks up a filterable field on an animal with single dict lookups.
+
+    Args:
+        animal (Dict): Dictionary containing animal information
+        field (str): Characteristics key, or "location" for the first location
+
+    Returns:
+        Optional[str]: The field value, or None if the animal does not have it
+    """
+    if field == "location":
+        locations = animal.get("locations")
+        return locations[0] if locations else None
+    return (animal.get("characteristics") or {}).get(field)
+
+
+def build_index(animals: List[Dict]) -> Dict[str, Dict[str, Set[int]]]:
+    """
+    Builds an inverted index of filterable values to animal positions.
 
     Args:
         animals (List[Dict]): List of animal dictionaries
+
+    Returns:
+        Dict[str, Dict[str, Set[int]]]: Mapping of field -> value -> indices
+            of the animals that have that value
+    """
+    # Only the fields offered by the filter menu are indexed
+    index = {field: {} for field, _ in _FILTER_FIELDS.values()}
+    for i, animal in enumerate(animals):
+        for field, field_index in index.items():
+            value = _field_value(animal, field)
+            if value is not None:
+                field_index.setdefault(value, set()).add(i)
+    return index
+
+
+def get_unique_values(index: Dict[str, Dict[str, Set[int]]], field: str) -> Set[str]:
+    """
+    Gets all unique values for a given field from the animals index.
+
+    Args:
+        index (Dict[str, Dict[str, Set[int]]]): Index built by build_index
         field (str): Field to get unique values for
 
     Returns:
         Set[str]: Set of unique values
     """
-    values = set()
-    for animal in animals:
-        if "characteristics" in animal and field in animal["characteristics"]:
-            values.add(animal["characteristics"][field])
-        elif field == "location" and "locations" in animal and animal["locations"]:
-            values.add(animal["locations"][0])
-    return values
+    return set(index.get(field, {}))
 
 
-def filter_animals(animals: List[Dict], filters: Dict[str, str]) -> List[Dict]:
+def filter_animals(animals: List[Dict], index: Dict[str, Dict[str, Set[int]]],
+                   filters: Dict[str, str]) -> List[Dict]:
     """
     Filters animals list by multiple criteria.
 
     Args:
         animals (List[Dict]): List of animal dictionaries
+        index (Dict[str, Dict[str, Set[int]]]): Index built by build_index
         filters (Dict[str, str]): Dictionary of field:value pairs to filter by
 
     Returns:
         List[Dict]: Filtered list of animals
     """
-    filtered_animals = animals
-    for field, value in filters.items():
-        if value == "all":
-            continue
+    id_sets = [
+        index.get(field, {}).get(value, set())
+        for field, value in filters.items() if value != "all"
+    ]
+    if not id_sets:
+        return list(animals)
+
+    matches = set.intersection(*id_sets)
+
+    # Keep the original order of the animals
+    return [animals[i] for i in sorted(matches)]
+
+
+def _read_number(prompt: str) -> Optional[int]:
+    """
+    Prompts for an integer, validating the input without raising.
+
+    Args:
+        prompt (str): Prompt shown to the user
+
+    Returns:
+        Optional[int]: Entered number, or None if the input was not a number
+    """
+    raw = input(prompt).strip()
+    digits = raw[1:] if raw[:1] in ("+", "-") else raw
+    if not digits.isdecimal():
+        print("Please enter a valid number.")
+        return None
+    return int(raw)
 
-        if field == "location":
-            filtered_animals = [
-                animal for animal in filtered_animals
-                if "locations" in animal
-                   and animal["locations"]
-                   and animal["locations"][0] == value
-            ]
-        else:
-            filtered_animals = [
-                animal for animal in filtered_animals
-                if "characteristics" in animal
-                   and field in animal["characteristics"]
-                   and animal["characteristics"][field] == value
-            ]
-
-    return filtered_animals
-
-
-def display_filter_menu(animals: List[Dict]) -> Dict[str, str]:
+
+def display_filter_menu(index: Dict[str, Dict[str, Set[int]]]) -> Dict[str, str]:
     """
     Displays filter options and gets user selections.
 
     Args:
-        animals (List[Dict]): List of animal dictionaries
+        index (Dict[str, Dict[str, Set[int]]]): Index built by build_index
 
     Returns:
         Dict[str, str]: Dictionary of selected filters
     """
-    filter_fields = {
-        1: ("skin_type", "Skin Type"),
-        2: ("diet", "Diet"),
-        3: ("type", "Type"),
-        4: ("location", "Location")
-    }
-
     filters = {}
-    print("\nFilter options:")
-    for num, (field, display_name) in filter_fields.items():
-        print(f"{num}. Filter by {display_name}")
-    print("0. Done selecting filters")
+    unique_cache: Dict[str, List[str]] = {}
+    # Render each menu as one write instead of a print per line
+    sys.stdout.write(
+        "\nFilter options:\n"
+        + "".join(f"{num}. Filter by {display_name}\n"
+                  for num, (field, display_name) in _FILTER_FIELDS.items())
+        + "0. Done selecting filters\n"
+    )
+    sys.stdout.flush()
 
     while True:
-        try:
-            choice = int(input("\nSelect a filter option (0 to finish): "))
-
-            if choice == 0:
-                break
-
-            if choice not in filter_fields:
-                print("Invalid choice. Please try again.")
-                continue
+        choice = _read_number("\nSelect a filter option (0 to finish): ")
+        if choice is None:
+            continue
 
-            field, display_name = filter_fields[choice]
+        if choice == 0:
+            break
 
-            # Get unique values for selected field
-            values = get_unique_values(animals, field)
-            print(f"\nAvailable {display_name} values:")
-            sorted_values = sorted(values)
-            for i, value in enumerate(sorted_values, 1):
-                print(f"{i}. {value}")
-            print("0. Show all")
+        if choice not in _FILTER_FIELDS:
+            print("Invalid choice. Please try again.")
+            continue
 
-            # Get user's value choice
-            while True:
-                try:
-                    value_choice = int(input(f"\nSelect {display_name}: "))
-                    if value_choice == 0:
-                        filters[field] = "all"
-                        break
-                    if 1 <= value_choice <= len(sorted_values):
-                        filters[field] = sorted_values[value_choice - 1]
-                        break
-                    print("Invalid choice. Please try again.")
-                except ValueError:
-                    print("Please enter a valid number.")
-
-        except ValueError:
-            print("Please enter a valid number.")
+        field, display_name = _FILTER_FIELDS[choice]
+
+        # Get unique values for selected field, sorting each field only once
+        sorted_values = unique_cache.get(field)
+        if sorted_values is None:
+            sorted_values = unique_cache[field] = sorted(get_unique_values(index, field))
+        sys.stdout.write(
+            f"\nAvailable {display_name} values:\n"
+            + "".join(f"{i}. {value}\n" for i, value in enumerate(sorted_values, 1))
+            + "0. Show all\n"
+        )
+        sys.stdout.flush()
+
+        # Get user's value choice
+        while True:
+            value_choice = _read_number(f"\nSelect {display_name}: ")
+            if value_choice is None:
+                continue
+            if value_choice == 0:
+                filters[field] = "all"
+                break
+            if 1 <= value_choice <= len(sorted_values):
+                filters[field] = sorted_values[value_choice - 1]
+                break
+            print("Invalid choice. Please try again.")
 
     return filters
 
@@ -241,28 +362,30 @@ def process_animals_to_html() -> Tuple[bool, str]:
     try:
         # Load animal data
         animals_data = load_data("animals_data.json")
+        index = build_index(animals_data)
 
         # Get filter selections from user
-        filters = display_filter_menu(animals_data)
+        filters = display_filter_menu(index)
 
-        # Apply filters
-        if filters:
-            animals_data = filter_animals(animals_data, filters)
+        # Apply filters, skipping the lookup when every field is "all"
+        active = {field: value for field, value in filters.items() if value != "all"}
+        if active:
+            animals_data = filter_animals(animals_data, index, active)
             if not animals_data:
                 return False, "No animals found matching the selected filters"
 
-        # Generate animals info string
-        animals_info = serialize_animals_list(animals_data)
-
-        # Read template and replace placeholder
+        # Split template around the placeholder
         template_content = read_template("animals_template.html")
-        final_html = template_content.replace("__REPLACE_ANIMALS_INFO__", animals_info)
+        head, _, tail = template_content.partition("__REPLACE_ANIMALS_INFO__")
 
-        # Write to output file
-        write_html(final_html, "animals.html")
+        # Stream the animal cards between the template halves
+        write_html_chunks(
+            itertools.chain((head,), iter_serialized_animals(animals_data), (tail,)),
+            "animals.html"
+        )
 
         # Prepare success message
-        filter_msg = ", ".join(f"{k}: {v}" for k, v in filters.items() if v != "all")
+        filter_msg = ", ".join(f"{k}: {v}" for k, v in active.items())
         return True, f"Generated HTML for {len(animals_data)} animals" + \
                      (f" with filters: {filter_msg}" if filter_msg else "")
 